@@ -1,4 +1,5 @@
 from pathlib import Path
+from collections import defaultdict
 
 inputs = Path(__file__.replace(".py", ".input")).read_text().splitlines()
 numbers = [
@@ -6,15 +7,41 @@ numbers = [
     "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine"
 ]
 
+Tokens = dict[str, list[tuple[str, int]]]
+Matcher = tuple[Tokens, Tokens]
 
-def solve(line: str, d: list[str]) -> int:
-    def get(x: (int, int)) -> int:
-        return x[0]
 
-    lhs = min(((i, n % 10) for n, c in enumerate(d) if (i := line.find(c)) != -1), key=get, default=(len(line), 0))[1]
-    rhs = max(((i, n % 10) for n, c in enumerate(d) if (i := line.rfind(c)) != -1), key=get, default=(-1, 0))[1]
-    return lhs * 10 + rhs
+def build_matcher(d: list[str]) -> Matcher:
+    heads: Tokens = defaultdict(list)
+    tails: Tokens = defaultdict(list)
+    for n, c in enumerate(d):
+        heads[c[0]].append((c, n % 10))
+        tails[c[-1]].append((c, n % 10))
+    return dict(heads), dict(tails)
 
 
-print(f"Part One: {sum(solve(l, numbers[:10]) for l in inputs)}")
-print(f"Part Two: {sum(solve(l, numbers) for l in inputs)}")
+def solve(line: str, m: Matcher) -> int:
+    heads, tails = m
+
+    def first() -> int:
+        for i, char in enumerate(line):
+            for c, value in heads.get(char, ()):
+                if line.startswith(c, i):
+                    return value
+        return 0
+
+    def last() -> int:
+        for i in range(len(line) - 1, -1, -1):
+            for c, value in tails.get(line[i], ()):
+                if line.endswith(c, 0, i + 1):
+                    return value
+        return 0
+
+    return first() * 10 + last()
+
+
+digits = build_matcher(numbers[:10])
+digits_and_words = build_matcher(numbers)
+
+print(f"Part One: {sum(solve(l, digits) for l in inputs)}")
+print(f"Part Two: {sum(solve(l, digits_and_words) for l in inputs)}")
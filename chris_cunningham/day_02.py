@@ -1,10 +1,9 @@
-from pathlib import Path
-from collections import defaultdict
+import re
 from math import prod
+from typing import Iterable, Iterator
 
-inputs = Path(__file__.replace(".py", ".input")).read_text().splitlines()
 Match = dict[str, int]
-Game = list[Match]
+Draw = tuple[int, str, int]
 
 limits = {
     "red": 12,
@@ -12,45 +11,42 @@ limits = {
     "blue": 14
 }
 
+DRAW_PATTERN = re.compile(r"Game (\d+)|(\d+) (red|green|blue)")
 
-def parse_games(data: list[str]) -> list[Game]:
-    result = []
+
+def parse_draws(data: Iterable[str]) -> Iterator[Draw]:
+    game_id = 0
     for line in data:
-        _, game = line.split(": ")
-        if not game.strip():
-            continue
+        for m in DRAW_PATTERN.finditer(line):
+            if m[1]:
+                game_id = int(m[1])
+                continue
+            yield game_id, m[3], int(m[2])
+
 
-        matches = []
-        for m in game.split("; "):
-            round_dict: defaultdict[str, int] = defaultdict(int)
+def game_maxima(draws: Iterable[Draw]) -> Iterator[tuple[int, Match]]:
+    current: int | None = None
+    g: Match = {}
 
-            for pair in m.split(", "):
-                count, color = pair.split(" ")
-                round_dict[str(color)] = int(count)
+    for game_id, color, count in draws:
+        if game_id != current:
+            if current is not None:
+                yield current, g
+            current, g = game_id, {"red": 0, "green": 0, "blue": 0}
+        g[color] = max(g[color], count)
 
-            matches.append(round_dict)
-        result.append(matches)
-    return result
+    if current is not None:
+        yield current, g
 
 
 part_one = 0
 part_two = 0
 
-for game_num, game in enumerate(parse_games(inputs), start=1):
-    g = {"red": 0, "green": 0, "blue": 0}
-    is_possible = True
-    part_one += game_num
-
-    for match in game:
-        g["red"] = max(g["red"], match["red"])
-        g["green"] = max(g["green"], match["green"])
-        g["blue"] = max(g["blue"], match["blue"])
-
-        if is_possible and any(g[col] > limits[col] for col, count in g.items()):
-            is_possible = False
-            part_one -= game_num
-
-    part_two += prod(g.values())
+with open(__file__.replace(".py", ".input")) as inputs:
+    for game_num, g in game_maxima(parse_draws(inputs)):
+        if all(g[col] <= limit for col, limit in limits.items()):
+            part_one += game_num
+        part_two += prod(g.values())
 
 print(f"Part One: {part_one}")
 print(f"Part Two: {part_two}")
@@ -1,63 +1,81 @@
-from pathlib import Path
-from typing import Iterator
-from itertools import product
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from itertools import chain
 from math import prod
+from typing import Iterable, Iterator, NamedTuple
 
-inputs = Path(__file__.replace(".py", ".input")).read_text().splitlines()
+NUMBER = re.compile(r"\d+")
+SYMBOL = re.compile(r"[^\d.]")
 
-Pt = tuple[int, int]
-numbers: list[tuple[int, list[Pt]]] = []
-symbols: set[Pt] = set()
-gears: set[Pt] = set()
-pts_to_numbers: dict[Pt, int] = {}
 
+class Row(NamedTuple):
+    # Number spans as parallel columns sorted by start, plus sorted symbol columns.
+    # Values stay Python ints so numbers of any width survive.
+    starts: array
+    ends: array
+    values: list[int]
+    symbols: array
+    gears: array
 
-def neighbours(point: Pt) -> Iterator[Pt]:
-    x, y = point
-    for offset_x, offset_y in product([-1, 0, 1], repeat=2):
-        yield x + offset_x, y + offset_y
 
+def tokenize(line: str) -> Row:
+    row = Row(array("l"), array("l"), [], array("l"), array("l"))
+    for m in NUMBER.finditer(line):
+        row.starts.append(m.start())
+        row.ends.append(m.end())
+        row.values.append(int(m[0]))
 
-def is_adjacent(number: tuple[int, list[Pt]]) -> bool:
-    _, coords = number
-    return any(any(pt in symbols for pt in neighbours(start)) for start in coords)
+    for m in SYMBOL.finditer(line):
+        row.symbols.append(m.start())
+        if m[0] == "*":
+            row.gears.append(m.start())
+    return row
 
 
-for y, line in enumerate(inputs):
-    num_buff: str = ""
-    num_pts: list[Pt] = []
+EMPTY_ROW = tokenize("")
 
-    for x, char in enumerate(line):
-        if char.isdigit():
-            num_buff += char
-            num_pts.append((x, y))
-            continue
 
-        if not char.isdigit() and num_buff != "":
-            new_number = int(num_buff)
-            numbers.append((int(num_buff), [*num_pts]))
-            pts_to_numbers |= {i: new_number for i in num_pts}
-            num_buff = ""
-            num_pts.clear()
+def has_symbol(row: Row, start: int, stop: int) -> bool:
+    i = bisect_left(row.symbols, start)
+    return i < len(row.symbols) and row.symbols[i] < stop
 
-        if char != ".":
-            symbols.add((x, y))
 
-        if char == "*":
-            gears.add((x, y))
+def adjacent_numbers(rows: Iterable[Row], x: int) -> list[int]:
+    # Spans in a row never overlap, so ends are sorted too; keep those with start <= x + 1 and end >= x
+    return [row.values[i] for row in rows
+            for i in range(bisect_left(row.ends, x), bisect_right(row.starts, x + 1))]
 
-    if num_buff != "":
-        new_number = int(num_buff)
-        numbers.append((int(num_buff), [*num_pts]))
-        pts_to_numbers |= {i: new_number for i in num_pts}
 
-part_one = sum(i[0] for i in numbers if is_adjacent(i))
-print(f"Part One: {part_one}")
+def stream_schematic(lines: Iterable[str]) -> Iterator[tuple[str, int]]:
+    """Yield ("part", number) and ("gear", ratio) as soon as each row's neighbours have been read."""
+    window: deque[Row] = deque([EMPTY_ROW, EMPTY_ROW], maxlen=3)
+
+    # A trailing blank row closes the neighbourhood of the last real one
+    for line in chain(lines, [""]):
+        window.append(tokenize(line.rstrip("\n")))
+        row = window[1]
+
+        for start, end, value in zip(row.starts, row.ends, row.values):
+            if any(has_symbol(r, start - 1, end + 1) for r in window):
+                yield "part", value
+
+        for x in row.gears:
+            ratios = adjacent_numbers(window, x)
+            if len(ratios) == 2:
+                yield "gear", prod(ratios)
 
+
+part_one = 0
 part_two = 0
-for gear in gears:
-    ratios = set(r for i in neighbours(gear) if (r := pts_to_numbers.get(i, 0)) != 0)
-    if len(ratios) == 2:
-        part_two += prod(ratios)
 
+with open(__file__.replace(".py", ".input")) as inputs:
+    for kind, value in stream_schematic(inputs):
+        if kind == "part":
+            part_one += value
+        else:
+            part_two += value
+
+print(f"Part One: {part_one}")
 print(f"Part Two: {part_two}")
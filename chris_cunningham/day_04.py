@@ -1,5 +1,7 @@
 from pathlib import Path
 from math import pow
+from functools import reduce
+from operator import or_
 
 inputs = Path(__file__.replace(".py", ".input")).read_text().splitlines()
 _test = """Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53
@@ -13,21 +15,21 @@ games: list[int] = []
 
 for line in inputs:
     numbers = line.split(": ")[1].split(" | ")
-    winning, have = [set(int(j) for j in i.split()) for i in numbers]
-    games.append(len(winning & have))
+    winning, have = [reduce(or_, (1 << int(j) for j in i.split()), 0) for i in numbers]
+    games.append((winning & have).bit_count())
 
 part_one = sum(int(pow(2, i - 1)) for i in games)
 print(f"Part One: {part_one}")
 
-stack: list[int] = [*range(len(games))]
-part_two = 0
 
-while stack:
-    card_num = stack.pop(0)
-    part_two += 1
-    matches = games[card_num]
+def copy_counts(matches: list[int]) -> list[int]:
+    counts = [1] * len(matches)
+    for card_num, won in enumerate(matches):
+        for i in range(card_num + 1, min(card_num + 1 + won, len(counts))):
+            counts[i] += counts[card_num]
+    return counts
 
-    if matches:
-        stack = [*range(card_num + 1, card_num + 1 + matches), *stack]
 
+copies = copy_counts(games)
+part_two = sum(copies)
 print(f"Part Two: {part_two}")
@@ -1,29 +1,14 @@
 from __future__ import annotations
 
+import pickle
 from pathlib import Path
-from functools import reduce, partial
-from typing import Callable
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import reduce
+from hashlib import sha256
 
 inputs = Path(__file__.replace(".py", ".input")).read_text().split("\n\n")
-
-
-def range_intersection(lhs: range, rhs: range) -> range | None:
-    start = max(lhs.start, rhs.start)
-    end = min(lhs.stop, rhs.stop)
-    return range(start, end) if end >= start else None
-
-
-def range_difference(lhs: range, rhs: range) -> list[range]:
-    if lhs.start < rhs.start <= lhs.stop <= rhs.stop:
-        return [range(lhs.start, rhs.start)]
-    elif rhs.start <= lhs.start < rhs.stop < lhs.stop:
-        return [range(rhs.stop, lhs.stop)]
-    elif lhs.start < rhs.start < rhs.stop < lhs.stop:
-        return [range(lhs.start, rhs.start), range(rhs.stop, lhs.stop)]
-    elif rhs.start <= lhs.start <= lhs.stop <= rhs.stop:
-        return []
-    else:
-        return [lhs]
+cache_dir = Path(__file__.replace(".py", ".cache"))
 
 
 class ConverterRange(object):
@@ -37,57 +22,163 @@ class ConverterRange(object):
     def map_value(self, value: int) -> int | None:
         return value - self.src.start + self.dst if value in self.src else None
 
-    def map_range(self, value: range) -> tuple[range, list[range]] | None:
-        inter = range_intersection(value, self.src)
-        diff = range_difference(value, self.src)
-        return (inter, diff) if inter else None
-
 
 class Converter(object):
     _ranges: list[ConverterRange]
+    _starts: list[int]
 
     def __init__(self, ranges: list[ConverterRange]):
-        self._ranges = ranges
+        self._ranges = sorted(ranges, key=lambda r: r.src.start)
+        self._starts = [r.src.start for r in self._ranges]
 
     @classmethod
     def parse(cls, data: str) -> Converter:
         return Converter([ConverterRange(*[int(i) for i in line.split(" ")]) for line in data.splitlines()[1:]])
 
     def map_value(self, value: int) -> int:
-        for rng in self._ranges:
-            if (new_value := rng.map_value(value)) is not None:
-                return new_value
+        i = bisect_right(self._starts, value) - 1
+        if i >= 0 and (new_value := self._ranges[i].map_value(value)) is not None:
+            return new_value
         return value
 
-    def map_range(self, seeds: list[range]) -> list[range]:
-        seeds = seeds[:]
-        new = []
 
-        while seeds:
-            s = seeds.pop()
-            for r in self._ranges:
-                mapped = r.map_range(s)
-                if mapped:
-                    inter, diff = mapped
-                    new.append(range(r.map_value(inter.start), r.map_value(inter.stop - 1)))
-                    seeds += diff
+class PiecewiseMap(object):
+    """Piecewise-linear map over the non-negative integers.
+
+    Piece i covers [starts[i], starts[i + 1]) and adds offsets[i]; the last piece runs to infinity.
+    """
+    _starts: list[int]
+    _offsets: list[int]
+
+    def __init__(self, starts: list[int], offsets: list[int]):
+        self._starts = []
+        self._offsets = []
+        for start, offset in zip(starts, offsets):
+            if self._starts and start == self._starts[-1]:
+                self._offsets[-1] = offset
+            elif not self._offsets or offset != self._offsets[-1]:
+                self._starts.append(start)
+                self._offsets.append(offset)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @classmethod
+    def from_converter(cls, converter: Converter) -> PiecewiseMap:
+        starts, offsets = [0], [0]
+        for r in converter._ranges:
+            if r.src.start > starts[-1]:
+                starts.append(r.src.start)
+                offsets.append(0)
+            starts[-1] = r.src.start
+            offsets[-1] = r.dst - r.src.start
+            starts.append(r.src.stop)
+            offsets.append(0)
+        return cls(starts, offsets)
+
+    def _piece(self, value: int) -> int:
+        return bisect_right(self._starts, value) - 1
+
+    def _stop(self, piece: int) -> float:
+        return self._starts[piece + 1] if piece + 1 < len(self._starts) else float("inf")
+
+    def compose(self, then: PiecewiseMap) -> PiecewiseMap:
+        """Return the map that applies self and then `then`."""
+        starts, offsets = [], []
+
+        for i, (start, offset) in enumerate(zip(self._starts, self._offsets)):
+            stop = self._stop(i)
+            j = then._piece(start + offset)
+            starts.append(start)
+            offsets.append(offset + then._offsets[j])
+
+            # Every breakpoint of `then` inside this piece's image splits it
+            for k in range(j + 1, len(then._starts)):
+                if then._starts[k] - offset >= stop:
                     break
-            else:
-                new.append(s)
+                starts.append(then._starts[k] - offset)
+                offsets.append(offset + then._offsets[k])
+
+        return PiecewiseMap(starts, offsets)
+
+    def map_value(self, value: int) -> int:
+        i = self._piece(value)
+        return value + self._offsets[i] if i >= 0 else value
 
+    def map_range(self, seeds: list[range]) -> list[range]:
+        new = []
+        for s in seeds:
+            value, i = s.start, self._piece(s.start)
+            while value < s.stop:
+                stop = min(s.stop, self._stop(i)) if i >= 0 else min(s.stop, self._starts[0])
+                offset = self._offsets[i] if i >= 0 else 0
+                new.append(range(value + offset, stop + offset))
+                value, i = stop, i + 1
         return new
 
 
-converters = [Converter.parse(i) for i in inputs[1:]]
+class CachedAlmanac(object):
+    """Parsed converters, the composed map and an LRU of mapped seed ranges for one almanac.
+
+    Stored on disk under a hash of the map sections, so any seed list reuses the same entry.
+    """
+    key: str
+    converters: list[Converter]
+    composed: PiecewiseMap
+    max_ranges: int
+    _ranges: OrderedDict[tuple[range, ...], list[range]]
+
+    def __init__(self, maps: list[str], max_ranges: int = 1024):
+        self.key = self.hash(maps)
+        self.converters = [Converter.parse(i) for i in maps]
+        self.composed = reduce(PiecewiseMap.compose, map(PiecewiseMap.from_converter, self.converters))
+        self.max_ranges = max_ranges
+        self._ranges = OrderedDict()
+
+    @staticmethod
+    def hash(maps: list[str]) -> str:
+        return sha256("\n\n".join(i.strip() for i in maps).encode()).hexdigest()
+
+    @classmethod
+    def load(cls, maps: list[str], directory: Path) -> CachedAlmanac:
+        path = directory / f"{cls.hash(maps)}.pickle"
+        if path.exists():
+            try:
+                return pickle.loads(path.read_bytes())
+            except (pickle.UnpicklingError, AttributeError, EOFError):
+                pass
+        return cls(maps)
+
+    def save(self, directory: Path) -> None:
+        directory.mkdir(exist_ok=True)
+        (directory / f"{self.key}.pickle").write_bytes(pickle.dumps(self))
+
+    def map_value(self, value: int) -> int:
+        return self.composed.map_value(value)
+
+    def map_range(self, seeds: list[range]) -> list[range]:
+        key = tuple(seeds)
+        if key in self._ranges:
+            self._ranges.move_to_end(key)
+            return self._ranges[key]
+
+        mapped = self.composed.map_range(seeds)
+        self._ranges[key] = mapped
+        if len(self._ranges) > self.max_ranges:
+            self._ranges.popitem(last=False)
+        return mapped
+
+
+almanac = CachedAlmanac.load(inputs[1:], cache_dir)
 
-single_converter: Callable[[int], int] = partial(reduce, lambda x, y: y.map_value(x), converters)
 seed_nums = [int(i) for i in inputs[0].split(": ")[1].split(" ")]
-part_one = min(single_converter(i) for i in seed_nums)
+part_one = min(almanac.map_value(i) for i in seed_nums)
 print(f"Part One: {part_one}")
 
-range_converter: Callable[[list[range]], list[range]] = partial(reduce, lambda x, y: y.map_range(x), converters)
 seed_iter = iter(seed_nums)
 seed_ranges = [range(i, i + next(seed_iter)) for i in seed_iter]
 
-part_two = min(i.start for i in range_converter(seed_ranges))
+part_two = min(i.start for i in almanac.map_range(seed_ranges))
 print(f"Part Two: {part_two}")
+
+almanac.save(cache_dir)
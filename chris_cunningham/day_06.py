@@ -1,20 +1,26 @@
-from math import sqrt, ceil, prod
+from math import isqrt, prod
 from pathlib import Path
 
-inputs = [i.split(':')[1].strip() for i in Path(__file__.replace(".py", ".input")).read_text().splitlines()]
-
 
 def solve_quad(time: int, distance: int) -> int:
-    root = 0.5 * sqrt(time**2 - 4.0 * distance)
-    _min = int(time * 0.5 - root) + 1
-    _max = int(ceil(time * 0.5 + root)) - 1
-    return _max - _min + 1
+    # hold * (time - hold) > distance  <=>  (2 * hold - time)**2 < time**2 - 4 * distance
+    discriminant = time * time - 4 * distance
+    if discriminant <= 0:
+        return 0
+
+    spread = isqrt(discriminant - 1)
+    _min = max((time - spread + 1) // 2, 0)
+    _max = min((time + spread) // 2, time)
+    return max(_max - _min + 1, 0)
+
 
+if __name__ == "__main__":
+    inputs = [i.split(':')[1].strip() for i in Path(__file__.replace(".py", ".input")).read_text().splitlines()]
 
-short_races = zip(*((int(i) for i in line.split()) for line in inputs))
-part_one = int(prod(solve_quad(t, d) for t, d in short_races))
-print(f"Part One: {part_one}")
+    short_races = zip(*((int(i) for i in line.split()) for line in inputs))
+    part_one = prod(solve_quad(t, d) for t, d in short_races)
+    print(f"Part One: {part_one}")
 
-long_race = tuple(int(i.replace(" ", "")) for i in inputs)
-part_two = int(solve_quad(long_race[0], long_race[1]))
-print(f"Part Two: {part_two}")
+    long_race = tuple(int(i.replace(" ", "")) for i in inputs)
+    part_two = solve_quad(long_race[0], long_race[1])
+    print(f"Part Two: {part_two}")
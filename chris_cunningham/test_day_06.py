@@ -0,0 +1,36 @@
+import random
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+
+_spec = spec_from_file_location("chris_day_06", Path(__file__).with_name("day_06.py"))
+day_06 = module_from_spec(_spec)
+_spec.loader.exec_module(day_06)
+
+
+def brute_force(time: int, distance: int) -> int:
+    return sum(1 for hold in range(time + 1) if hold * (time - hold) > distance)
+
+
+def test_matches_brute_force_on_small_races():
+    for time in range(80):
+        for distance in range(-5, time * time // 4 + 5):
+            assert day_06.solve_quad(time, distance) == brute_force(time, distance), (time, distance)
+
+
+def test_record_at_best_distance_cannot_be_beaten():
+    # Odd time with the record at k * (k + 1) leaves a discriminant of exactly 1
+    for k in [0, 1, 7, 10**7, 10**40]:
+        assert day_06.solve_quad(2 * k + 1, k * (k + 1)) == 0
+        assert day_06.solve_quad(2 * k + 1, k * (k + 1) - 1) == 2
+
+
+def test_big_races_stay_exact():
+    rng = random.Random(6)
+    for _ in range(200):
+        time = rng.randrange(2**60, 2**200)
+        spread = rng.randrange(1, 2**40)
+        distance = (time * time - spread * spread) // 4
+        count = day_06.solve_quad(time, distance)
+        low = (time - count + 1) // 2
+        assert low * (time - low) > distance
+        assert (low - 1) * (time - low + 1) <= distance
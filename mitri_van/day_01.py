@@ -72,7 +72,11 @@ Your puzzle answer was 55260.
 
 Both parts of this puzzle are complete! They provide two gold stars: **
 """
-import re
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
 
 test_data_1 = [ '1abc2',
                 'pqr3stu8vwx',
@@ -103,27 +107,76 @@ number_mapping = [ ('one', '1'),
 
 DEBUG = False
 
+# Bytes scanned per array pass by the bulk engine
+BULK_WINDOW_SIZE = 1 << 22
+
+class DigitMatcher():
+    """ Aho-Corasick automaton over spelled and literal digits.
+
+    Built once from a word mapping, then scans a line left to right in a single
+    pass, reporting every match including overlapping ones (oneight, twone...).
+    """
+
+    def __init__(self, mapping):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]
+
+        for word, digit in mapping:
+            self._add_word(word, digit)
+        for digit in '0123456789':
+            self._add_word(digit, digit)
+
+        self._build_links()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} ({len(self.goto)} states)>"
+
+    def _add_word(self, word, digit):
+        state = 0
+        for character in word:
+            if character not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(None)
+                self.goto[state][character] = len(self.goto) - 1
+            state = self.goto[state][character]
+        self.output[state] = digit
+
+    def _build_links(self):
+        # Breadth first so every fail link points at an already finished state
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                fallback = self.fail[state]
+                while fallback and character not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(character, 0)
+
+                # No digit word is a suffix of another, so one output per state is enough
+                if self.output[next_state] is None:
+                    self.output[next_state] = self.output[self.fail[next_state]]
+
+    def scan(self, data):
+        state = 0
+        for character in data:
+            while state and character not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(character, 0)
+
+            if self.output[state] is not None:
+                yield self.output[state]
+
+
+DIGIT_MATCHER = DigitMatcher(number_mapping)
+
+
 def parse_line(data):
     log = data
-
-    data = re.sub('(oneight)', '18', data)
-    data = re.sub('(twone)', '21', data)
-    data = re.sub('(threeight)', '38', data)
-    data = re.sub('(fiveight)', '58', data)
-    data = re.sub('(sevenine)', '79', data)
-    data = re.sub('(eightwo)', '82', data)
-    data = re.sub('(eighthree)', '83', data)
-    data = re.sub('(nineight)', '98', data)
-
-    data = re.sub('(one)', '1', data)
-    data = re.sub('(two)', '2', data)
-    data = re.sub('(three)', '3', data)
-    data = re.sub('(four)', '4', data)
-    data = re.sub('(five)', '5', data)
-    data = re.sub('(six)', '6', data)
-    data = re.sub('(seven)', '7', data)
-    data = re.sub('(eight)', '8', data)
-    data = re.sub('(nine)', '9', data)
+    data = ''.join(DIGIT_MATCHER.scan(data))
 
     log = (f'{data} - {log}')
     return data, log
@@ -152,6 +205,109 @@ def get_calibration_values(data, part_two=False):
     return calibration_values
 
 
+def _chunk_boundaries(path, chunk_size, start=0, stop=None):
+    stop = os.path.getsize(path) if stop is None else stop
+    boundaries = [start]
+
+    with open(path, 'rb') as input_file:
+        while boundaries[-1] + chunk_size < stop:
+            # Move each cut forward to the start of the next record
+            input_file.seek(boundaries[-1] + chunk_size - 1)
+            input_file.readline()
+            boundaries.append(min(input_file.tell(), stop))
+    boundaries.append(stop)
+
+    return [(cut_start, cut_stop) for cut_start, cut_stop in zip(boundaries, boundaries[1:]) if cut_start < cut_stop]
+
+
+def _window_calibration_sum(window, part_two):
+    # -1 marks a byte that does not start a digit
+    values = numpy.full(window.size, -1, dtype=numpy.int8)
+    is_digit = (window >= ord('0')) & (window <= ord('9'))
+    values[is_digit] = window[is_digit] - ord('0')
+
+    if part_two:
+        # Words can overlap but never start on the same byte, so tag each start
+        for word, digit in number_mapping:
+            count = window.size - len(word) + 1
+            if count <= 0:
+                continue
+            found = numpy.ones(count, dtype=bool)
+            for offset, character in enumerate(word.encode()):
+                found &= window[offset:offset + count] == character
+            values[:count][found] = int(digit)
+
+    hits = numpy.flatnonzero(values >= 0)
+    if not hits.size:
+        return 0
+
+    # First hit at or after each record start, last hit before each record end
+    newlines = numpy.flatnonzero(window == ord('\n'))
+    record_starts = numpy.r_[0, newlines + 1]
+    record_ends = numpy.r_[newlines, window.size]
+
+    firsts = numpy.searchsorted(hits, record_starts)
+    lasts = numpy.searchsorted(hits, record_ends) - 1
+    has_digit = lasts >= firsts
+
+    tens = values[hits[firsts[has_digit]]].sum(dtype=numpy.int64)
+    ones = values[hits[lasts[has_digit]]].sum(dtype=numpy.int64)
+    return int(tens * 10 + ones)
+
+
+def get_calibration_sum_bulk(path, part_two=False, start=0, stop=None, window_size=BULK_WINDOW_SIZE):
+    """ Sum the calibration values of a file without building a string per line.
+
+    The file is memory-mapped and classified as raw bytes one window at a time;
+    windows end on a newline, so the first and last digit of every record are
+    picked out with array ops bounded by the window size. start/stop restrict
+    the scan to a byte slice that begins and ends on a record boundary.
+    """
+    stop = os.path.getsize(path) if stop is None else stop
+    if start >= stop:
+        return 0
+
+    buffer = numpy.memmap(path, dtype=numpy.uint8, mode='r')
+    total = 0
+    for window_start, window_stop in _chunk_boundaries(path, window_size, start, stop):
+        total += _window_calibration_sum(buffer[window_start:window_stop], part_two)
+
+    return total
+
+
+def _solve_chunk(path, start, stop, part_two, keep_values):
+    if not keep_values:
+        return get_calibration_sum_bulk(path, part_two=part_two, start=start, stop=stop)
+
+    with open(path, 'rb') as input_file:
+        input_file.seek(start)
+        data = input_file.read(stop - start).decode().splitlines()
+    return get_calibration_values([x.rstrip() for x in data], part_two=part_two)
+
+
+def get_calibration_sum_parallel(path, part_two=False, workers=None, keep_values=False,
+                                 chunk_size=BULK_WINDOW_SIZE):
+    """ Split the file into fixed-size chunks on record boundaries and solve them in a process pool.
+
+    Returns the summed calibration value, or (sum, per-line values) when
+    keep_values is set.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunk_boundaries(path, chunk_size)
+    if not chunks:
+        return (0, []) if keep_values else 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_solve_chunk, *zip(*[(path, start, stop, part_two, keep_values)
+                                                          for start, stop in chunks])))
+
+    if not keep_values:
+        return sum(results)
+
+    calibration_values = [value for result in results for value in result]
+    return sum(calibration_values), calibration_values
+
+
 def main(raw_data , part_two = False):
     calibration_values = get_calibration_values(raw_data, part_two=part_two)
     print(f'The sum of: {calibration_values}\n\tis {sum(calibration_values)}\n')
@@ -95,6 +95,9 @@ Your puzzle answer was 63981.
 
 Both parts of this puzzle are complete! They provide two gold stars: **
 """
+from collections import defaultdict
+
+import numpy
 
 test_data = [ 'Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green',
               'Game 2: 1 blue, 2 green; 3 green, 4 blue, 1 red; 1 green, 1 blue',
@@ -105,107 +108,195 @@ test_data = [ 'Game 1: 3 blue, 4 red; 1 red, 2 green, 6 blue; 2 green',
 
 DEBUG = True
 
-class DiceSet():
+COLORS = ('red', 'green', 'blue')
+TEST_DRAW = (12, 13, 14)
+
+
+class GameStore():
+    """ Columnar record of every draw: one row per draw, one column per color. """
+
+    def __init__(self, game_ids, round_ids, counts):
+        self.game_ids = numpy.asarray(game_ids, dtype=numpy.int64)
+        self.round_ids = numpy.asarray(round_ids, dtype=numpy.int64)
+        self.counts = numpy.asarray(counts, dtype=numpy.int64).reshape(-1, len(COLORS))
 
-    def __init__(self, red=0, green=0, blue=0):
-        self.red = red
-        self.green = green
-        self.blue = blue
+        self._ids = None
+        self._maxima = None
 
     def __repr__(self):
-        return f"<{self.__class__.__name__} ({self.red}, {self.green}, {self.blue})>"
+        return f"<{self.__class__.__name__} ({len(self.ids)} games, {len(self.game_ids)} draws)>"
 
-    def __lt__(self, other):
-        result_red = self.red <= other.red
-        result_green = self.green <= other.green
-        result_blue = self.blue <= other.blue
+    def _reduce(self):
+        if not self.game_ids.size:
+            self._ids = self.game_ids.copy()
+            self._maxima = self.counts.copy()
+            return
 
-        return result_red and result_green and result_blue
+        # Draws of a game are contiguous, so one reduceat gives every game's maxima
+        starts = numpy.flatnonzero(numpy.r_[True, self.game_ids[1:] != self.game_ids[:-1]])
+        self._ids = self.game_ids[starts]
+        self._maxima = numpy.maximum.reduceat(self.counts, starts, axis=0)
 
-    def __gt__(self, other):
-        result_red = self.red > other.red
-        result_green = self.green > other.green
-        result_blue = self.blue > other.blue
+    @property
+    def ids(self):
+        if self._ids is None:
+            self._reduce()
+        return self._ids
 
-        return result_red and result_green and result_blue
+    @property
+    def maxima(self):
+        if self._maxima is None:
+            self._reduce()
+        return self._maxima
 
+    @property
+    def cube_powers(self):
+        return self.maxima.prod(axis=1)
 
-class GameObject():
+    def is_valid(self, test_draw):
+        return (self.maxima <= numpy.asarray(test_draw)).all(axis=1)
 
-    def __init__(self, id):
-        self.id = id
-        self.sets = []
+    def valid_ids(self, test_draw):
+        return self.ids[self.is_valid(test_draw)]
 
-    def __repr__(self):
-        return f"<{self.__class__.__name__}_{self.id} ({self.sets})>"
+    def limit_index(self):
+        return LimitIndex(self.ids, self.maxima)
 
-    @property
-    def cube_power(self):
-        red = max([x.red for x in self.sets if x.red != 0])
-        green = max([x.green for x in self.sets if x.green != 0])
-        blue = max([x.blue for x in self.sets if x.blue != 0])
 
-        return red * green * blue
+class LimitIndex():
+    """ Answers "sum of ids possible under (r, g, b)" for many bag configurations.
 
-    def is_valid(self, test_draw):
-        result = []
-        for _set in self.sets:
-            if _set < test_draw:
-                result.append(True)
-            else:
-                result.append(False)
-        return all(result)
+    Games sharing the same maxima are folded together, then a cumulative id
+    sum is built over the sorted distinct maxima of each color, so a query is
+    three binary searches and one lookup. If that grid would be too large, a
+    batch of queries is answered offline instead: queries and maxima are swept
+    in red order and maxima are added to a sparse 2D Fenwick tree over green
+    and blue ranks, so each query costs O(log^2) rather than a full rescan.
+    """
 
-    def parse_dice_draw(self, dice_draw):
-        args = {}
+    MAX_CELLS = 1 << 22
 
-        for draw in dice_draw:
-            num_dice, color_dice = draw.split()
-            args[color_dice] = int(num_dice)
+    def __init__(self, ids, maxima):
+        maxima = numpy.asarray(maxima, dtype=numpy.int64).reshape(-1, len(COLORS))
+        self.triples, inverse = numpy.unique(maxima, axis=0, return_inverse=True)
+        self.weights = numpy.zeros(len(self.triples), dtype=numpy.int64)
+        numpy.add.at(self.weights, inverse.ravel(), numpy.asarray(ids, dtype=numpy.int64))
 
-        self.sets.append(DiceSet(**args))
+        self.axes = [numpy.unique(self.triples[:, idx]) for idx in range(len(COLORS))]
+        self.grid = None
 
-    def populate_sets(self, data):
-        for datum in data:
-            dice_draw = datum.split(', ')
-            self.parse_dice_draw(dice_draw)
+        shape = tuple(len(axis) for axis in self.axes)
+        if len(self.triples) and numpy.prod(shape) <= self.MAX_CELLS:
+            self.grid = numpy.zeros(shape, dtype=numpy.int64)
+            cells = tuple(numpy.searchsorted(axis, self.triples[:, idx]) for idx, axis in enumerate(self.axes))
+            self.grid[cells] = self.weights
+            for idx in range(len(COLORS)):
+                numpy.cumsum(self.grid, axis=idx, out=self.grid)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} ({len(self.triples)} distinct maxima)>"
+
+    def sum_valid_ids(self, test_draw):
+        return int(self.query([test_draw])[0])
+
+    def query(self, test_draws):
+        test_draws = numpy.asarray(test_draws, dtype=numpy.int64).reshape(-1, len(COLORS))
+
+        if self.grid is None:
+            return self._sweep(test_draws)
+
+        # Last distinct maximum that still fits under each limit; -1 means none does
+        cells = [numpy.searchsorted(axis, test_draws[:, idx], side='right') - 1 for idx, axis in enumerate(self.axes)]
+        result = self.grid[tuple(numpy.maximum(cell, 0) for cell in cells)]
+        result[(numpy.stack(cells) < 0).any(axis=0)] = 0
+        return result
+
+    def _sweep(self, test_draws):
+        greens, blues = self.axes[1], self.axes[2]
+        order = numpy.argsort(self.triples[:, 0], kind='stable')
+        reds = self.triples[order, 0].tolist()
+        # 1-based Fenwick ranks of each folded maximum
+        green_ranks = (numpy.searchsorted(greens, self.triples[order, 1]) + 1).tolist()
+        blue_ranks = (numpy.searchsorted(blues, self.triples[order, 2]) + 1).tolist()
+        weights = self.weights[order].tolist()
+
+        # Number of distinct maxima fitting under each query's green and blue limit
+        green_limits = numpy.searchsorted(greens, test_draws[:, 1], side='right').tolist()
+        blue_limits = numpy.searchsorted(blues, test_draws[:, 2], side='right').tolist()
+
+        # Flat list tree when green x blue fits, sparse dict otherwise
+        width = len(blues) + 1
+        if (len(greens) + 1) * width <= self.MAX_CELLS:
+            tree = [0] * ((len(greens) + 1) * width)
+        else:
+            tree = defaultdict(int)
+        result = numpy.zeros(len(test_draws), dtype=numpy.int64)
+        inserted = 0
+
+        for query in numpy.argsort(test_draws[:, 0], kind='stable').tolist():
+            red = test_draws[query, 0]
+            while inserted < len(reds) and reds[inserted] <= red:
+                green = green_ranks[inserted]
+                while green <= len(greens):
+                    blue = blue_ranks[inserted]
+                    while blue <= len(blues):
+                        tree[green * width + blue] += weights[inserted]
+                        blue += blue & -blue
+                    green += green & -green
+                inserted += 1
+
+            total = 0
+            green = green_limits[query]
+            while green > 0:
+                blue = blue_limits[query]
+                while blue > 0:
+                    total += tree[green * width + blue]
+                    blue -= blue & -blue
+                green -= green & -green
+            result[query] = total
+
+        return result
 
 
 def parse_data(raw_data):
-    games = []
+    game_ids = []
+    round_ids = []
+    counts = []
 
     for datum in raw_data:
         result = datum.split(': ')
-        game_obj = GameObject(int(result[0].lstrip('Game ')))
-        game_obj.populate_sets(result[1].split('; '))
-        games.append(game_obj)
+        game_id = int(result[0].lstrip('Game '))
+
+        for round_id, dice_draw in enumerate(result[1].split('; ')):
+            draw = dict.fromkeys(COLORS, 0)
+            for dice in dice_draw.split(', '):
+                num_dice, color_dice = dice.split()
+                draw[color_dice] = int(num_dice)
+
+            game_ids.append(game_id)
+            round_ids.append(round_id)
+            counts.extend(draw[color] for color in COLORS)
 
-    return games
+    return GameStore(game_ids, round_ids, counts)
 
 
 def main(raw_data):
-    games= parse_data(raw_data)
+    games = parse_data(raw_data)
 
     # Part 1
-    test_draw = DiceSet(red=12, green=13, blue=14)
-    result = []
-    for game in games:
-        if DEBUG:
-            if game.is_valid(test_draw):
-                print(f'Game {game.id}: {test_draw}\n{game.sets}\n')
-            else:
-                print(f'********Game {game.id}: {test_draw}\n{game.sets}\n')
-        if game.is_valid(test_draw):
-            result.append(game.id)
-    result = [game.id for game in games if game.is_valid(test_draw)]
+    if DEBUG:
+        for game_id, valid, maxima in zip(games.ids, games.is_valid(TEST_DRAW), games.maxima):
+            prefix = '' if valid else '********'
+            print(f'{prefix}Game {game_id}: {TEST_DRAW}\n{tuple(maxima)}\n')
+    result = games.valid_ids(TEST_DRAW).tolist()
 
     print(f'The sum of: {result}\n\tis {sum(result)}\n')
 
     # Part 2
-    result_pt2 = []
-    for game in games:
-        if DEBUG: print(f'Game {game.id}:\tPower = {game.cube_power}')
-        result_pt2.append(game.cube_power)
+    result_pt2 = games.cube_powers.tolist()
+    if DEBUG:
+        for game_id, power in zip(games.ids, result_pt2):
+            print(f'Game {game_id}:\tPower = {power}')
 
     print(f'\nThe sum of: {result_pt2}\n\tis {sum(result_pt2)}\n')
 
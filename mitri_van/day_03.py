@@ -96,6 +96,8 @@ Your puzzle answer was 78915902.
 Both parts of this puzzle are complete! They provide two gold stars: **
 
 """
+from collections import defaultdict
+
 import numpy
 
 test_data = [ '467..114..',
@@ -113,168 +115,89 @@ test_data = [ '467..114..',
 
 DEBUG = False
 
-class Part():
-
-    def __init__(self, part_number, gear_pos):
-        self.part_number = part_number
-        self.gear = gear_pos
-
-    def __repr__(self):
-        return f"<{self.__class__.__name__} ({self.part_number}, [{self.gear[0]}, {self.gear[1]}])>"
-
-
-def is_valid_symbol(character, gear_only=False):
-    if gear_only:
-        if not character.isdigit() and character == '*':
-            return True
-
-    else:
-        if not character.isdigit() and character != '.':
-            return True
-
-    return False
+class SchematicGrid():
+    """ Engine schematic held as a byte array, with number spans found by array ops. """
 
+    def __init__(self, data):
+        width = max((len(datum) for datum in data), default=0)
+        rows = ''.join(datum.ljust(width, '.') for datum in data).encode()
+        self.grid = numpy.frombuffer(rows, dtype=numpy.uint8).reshape(len(data), width)
 
+        self.digits = (self.grid >= ord('0')) & (self.grid <= ord('9'))
+        self.symbols = ~self.digits & (self.grid != ord('.'))
 
-def check_validity(row, col, data):
-    is_valid = []
+        self.rows, self.starts, self.ends, self.values = self._find_numbers()
 
-    for cur_row in range(row - 1, row + 2):
-        if len(data) - 1 >= cur_row >= 0:
-            for cur_col in range(col - 1, col + 2):
-                if len(data[0]) - 1 >= cur_col >= 0:
-                    if DEBUG: print(f'\t{cur_row}, {cur_col} : {data[cur_row][cur_col]}')
-                    is_valid.append(is_valid_symbol(data[cur_row][cur_col]))
-                else:
-                    if DEBUG: print(f'--- {cur_row}, {cur_col}')
-    if any(is_valid):
-        if DEBUG: print(f'**********\tValid number!')
-    else:
-        if DEBUG: print('**********')
-
-    return any(is_valid)
-
-
-def find_current_gear(row, col, data):
-    is_valid = []
-    found_gear = []
-
-    # Check by rows
-    for cur_row in range(row - 1, row + 2):
-        if len(data) - 1 >= cur_row >= 0: # Check bounds
-            # Check by column
-            for cur_col in range(col - 1, col + 2):
-                if len(data[0]) - 1 >= cur_col >= 0: # Check bounds
-                    if DEBUG: print(f'\t{cur_row}, {cur_col} : {data[cur_row][cur_col]}')
-                    result = is_valid_symbol(data[cur_row][cur_col], gear_only=True)
-                    is_valid.append(result)
-                    if result:
-                        found_gear = [cur_row, cur_col]
-                else:
-                    if DEBUG: print(f'--- {cur_row}, {cur_col}')
-    if any(is_valid):
-        if DEBUG: print(f'**********\tValid gear at {found_gear}')
-    else:
-        if DEBUG: print('**********')
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.grid.shape} ({len(self.values)} numbers)>"
+
+    def _find_numbers(self):
+        # Edges of each digit run, padded so runs touching the border still close
+        edges = numpy.diff(numpy.pad(self.digits, ((0, 0), (1, 1))).astype(numpy.int8), axis=1)
+        rows, starts = numpy.nonzero(edges == 1)
+        _, ends = numpy.nonzero(edges == -1)
+
+        # Past 18 digits int64 would overflow, so read those spans as Python ints
+        if len(starts) and (ends - starts).max() > 18:
+            values = numpy.array([int(self.grid[row, start:end].tobytes())
+                                  for row, start, end in zip(rows, starts, ends)], dtype=object)
+            return rows, starts, ends, values
+
+        # Every digit cell adds digit * 10 ** (places left in its run) to its run
+        digit_rows, digit_cols = numpy.nonzero(self.digits)
+        run_ids = numpy.cumsum(edges[digit_rows, digit_cols] == 1) - 1
+        places = ends[run_ids] - 1 - digit_cols
+        digits = self.grid[digit_rows, digit_cols].astype(numpy.int64) - ord('0')
+
+        values = numpy.zeros(len(starts), dtype=numpy.int64)
+        numpy.add.at(values, run_ids, digits * 10 ** places.astype(numpy.int64))
+
+        return rows, starts, ends, values
+
+    def dilate(self, mask):
+        """ Grow a boolean mask by one cell in all eight directions. """
+        height, width = mask.shape
+        padded = numpy.pad(mask, 1)
+        result = numpy.zeros_like(mask)
+        for row in range(3):
+            for col in range(3):
+                result |= padded[row:row + height, col:col + width]
+        return result
+
+    def part_number_mask(self):
+        # Count symbol-adjacent cells under each span with a per-row prefix sum
+        adjacent = numpy.pad(numpy.cumsum(self.dilate(self.symbols), axis=1), ((0, 0), (1, 0)))
+        return adjacent[self.rows, self.ends] > adjacent[self.rows, self.starts]
+
+    def part_numbers(self):
+        return self.values[self.part_number_mask()]
+
+    def gear_index(self):
+        """ Map every gear position to the numbers adjacent to it. """
+        gears = set(map(tuple, numpy.argwhere(self.grid == ord('*')).tolist()))
+        index = defaultdict(list)
+
+        # Walk each span's border once; a number may touch several gears
+        for row, start, end, value in zip(self.rows.tolist(), self.starts.tolist(),
+                                          self.ends.tolist(), self.values.tolist()):
+            for cur_row in range(row - 1, row + 2):
+                for cur_col in range(start - 1, end + 1):
+                    if (cur_row, cur_col) in gears:
+                        index[(cur_row, cur_col)].append(value)
+
+        return index
 
-    return any(is_valid), found_gear
 
 def parse_data(data):
-    is_valid = []
-    part_numbers = []
-
-    # Scan line
-    for row, datum in enumerate(data):
-        found_number = ''
-        number_found = False
-
-        for col, character in enumerate(datum):
-            if DEBUG: print(f'[{row}, {col}]')
-            if character.isdigit():
-                number_found = True
-                found_number += character
-                is_valid.append(check_validity(row, col, data))
-
-            else:
-                # Check validity
-                if number_found:
-                    if any(is_valid):
-                        part_numbers.append(int(found_number))
-                    # Reset temp variables
-                    number_found = False
-                    is_valid = []
-                    found_number = ''
-
-            if col == len(datum) - 1:
-                # Check validity
-                if number_found:
-                    if any(is_valid):
-                        part_numbers.append(int(found_number))
-                    # Reset temp variables
-                    number_found = False
-                    is_valid = []
-                    found_number = ''
-
-    return part_numbers
+    return SchematicGrid(data).part_numbers().tolist()
 
 
 def parse_data_p2(data):
-
-    is_valid = []
-    part_numbers = []
     gear_ratios = []
-    parts = []
-
-    # Scan line
-    for row, datum in enumerate(data):
-        current_gear = ''
-        found_number = ''
-        number_found = False
-
-        for col, character in enumerate(datum):
-            if DEBUG: print(f'[{row}, {col}]')
-            if character.isdigit():
-                number_found = True
-                found_number += character
-                # is_valid.append(check_validity(row, col, data))
-                result, new_gear = find_current_gear(row, col, data)
-                is_valid.append(result)
-                if result:
-                    current_gear = new_gear
-
-            else:
-                # Check validity
-                if number_found:
-                    if any(is_valid):
-                        part_numbers.append(int(found_number))
-                        parts.append(Part(int(found_number), current_gear))
-
-                    # Reset temp variables
-                    number_found = False
-                    is_valid = []
-                    found_number = ''
-                    current_gear = ''
-
-            if col == len(datum) - 1:
-                # Check validity
-                if number_found:
-                    if any(is_valid):
-                        part_numbers.append(int(found_number))
-                        parts.append(Part(int(found_number), current_gear))
-
-                    # Reset temp variables
-                    number_found = False
-                    is_valid = []
-                    found_number = ''
-                    current_gear = ''
-
-    gears = {tuple(x.gear) for x in parts}
-    parts_by_gear = [[x for x in parts if tuple(x.gear)==gear] for gear in gears]
-
-    for part_group in parts_by_gear:
-        if len(part_group) > 1:
-            gear_group = [x.part_number for x in part_group]
-            gear_ratios.append(numpy.prod(gear_group))
+
+    for numbers in SchematicGrid(data).gear_index().values():
+        if len(numbers) == 2:
+            gear_ratios.append(numbers[0] * numbers[1])
 
     return gear_ratios
 
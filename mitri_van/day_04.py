@@ -123,6 +123,10 @@ Your puzzle answer was 5571760.
 
 Both parts of this puzzle are complete! They provide two gold stars: **
 """
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy
 
 test_data = [ 'Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53',
               'Card 2: 13 32 20 16 61 | 61 30 68 82 17 32 24 19',
@@ -133,6 +137,13 @@ test_data = [ 'Card 1: 41 48 83 86 17 | 83 86  6 31 17  9 48 53',
             ]
 
 
+def to_mask(numbers):
+    mask = 0
+    for number in numbers:
+        mask |= 1 << number
+    return mask
+
+
 class ScratchCard():
 
     def __init__(self, id, winning_numbers, numbers, quantity=1):
@@ -141,6 +152,10 @@ class ScratchCard():
         self.numbers = numbers
         self.winning_numbers = winning_numbers
 
+        # Card numbers are small, so each side packs into one integer bitmask
+        self.number_mask = to_mask(numbers)
+        self.winning_mask = to_mask(winning_numbers)
+
     def __repr__(self):
         return f"<{self.__class__.__name__} {self.id} ({self.winning_numbers},{self.numbers})>"
 
@@ -165,28 +180,140 @@ def parse_data(raw_data):
     return cards
 
 
+def count_matches(card):
+    return (card.number_mask & card.winning_mask).bit_count()
+
+
 def check_card_points(card):
     points = 0
 
-    winning_numbers = [x for x in card.numbers if x in card.winning_numbers]
-    if winning_numbers:
-        points =  pow(2, len(winning_numbers) - 1)
+    matches = count_matches(card)
+    if matches:
+        points = pow(2, matches - 1)
 
     return points
 
 
-def win_scratch_cards(card, scratch_cards):
-    points = 0
-    winning_numbers = [x for x in card.numbers if x in card.winning_numbers]
+def win_scratch_cards(scratch_cards):
+    # Difference array of copies won: a card adds its quantity to the start of
+    # its match window and takes it back off just past the end
+    copies_won = [0] * (len(scratch_cards) + 1)
+    running_copies = 0
 
-    for i in range(0, card.quantity):
-        for card_num in range(scratch_cards.index(card)+1, scratch_cards.index(card)+len(winning_numbers)+1):
-            if card_num < len(scratch_cards):
-                scratch_cards[card_num].quantity += 1
-            else:
-                print(f'Invalid winning card #: {card_num}')
+    for idx, card in enumerate(scratch_cards):
+        running_copies += copies_won[idx]
+        card.quantity += running_copies
 
-    return points
+        matches = count_matches(card)
+        if matches:
+            copies_won[idx + 1] += card.quantity
+            copies_won[min(idx + 1 + matches, len(scratch_cards))] -= card.quantity
+
+    return [x.quantity for x in scratch_cards]
+
+
+def parse_decks(raw_data):
+    decks = [[]]
+
+    # Blank lines separate decks
+    for datum in raw_data:
+        if datum.strip():
+            decks[-1].append(datum)
+        elif decks[-1]:
+            decks.append([])
+
+    return [deck for deck in decks if deck]
+
+
+def load_decks(path):
+    paths = [path]
+    if os.path.isdir(path):
+        paths = [os.path.join(path, name) for name in sorted(os.listdir(path))]
+
+    decks = []
+    for deck_path in paths:
+        with open(deck_path, "r") as input_file:
+            decks += parse_decks(input_file.read().splitlines())
+
+    return decks
+
+
+def pack_decks(decks):
+    """ Pack every card of every deck into one pair of boolean matrices.
+
+    Row i of each matrix is a card, column n is set when the number n is on
+    that side of it. Also returns the number of cards in each deck.
+    """
+    winning_cells = ([], [])
+    number_cells = ([], [])
+    row = 0
+
+    for deck in decks:
+        for datum in deck:
+            winning_numbers, numbers = datum.split(': ')[1].split(' | ')
+            for cells, side in ((winning_cells, winning_numbers), (number_cells, numbers)):
+                for number in side.split():
+                    cells[0].append(row)
+                    cells[1].append(int(number))
+            row += 1
+
+    width = max(winning_cells[1] + number_cells[1], default=0) + 1
+    winning = numpy.zeros((row, width), dtype=bool)
+    winning[winning_cells] = True
+    numbers = numpy.zeros((row, width), dtype=bool)
+    numbers[number_cells] = True
+
+    return winning, numbers, numpy.array([len(deck) for deck in decks], dtype=numpy.int64)
+
+
+def score_packed_decks(winning, numbers, lengths):
+    if not len(lengths):
+        return []
+
+    matches = (winning & numbers).sum(axis=1)
+    points = numpy.where(matches > 0, numpy.left_shift(1, numpy.maximum(matches - 1, 0)), 0)
+    offsets = numpy.r_[0, numpy.cumsum(lengths)[:-1]]
+    part_one = numpy.add.reduceat(points, offsets)
+
+    # Lay the decks out as rows and walk card positions across all of them at once
+    deck_ids = numpy.repeat(numpy.arange(len(lengths)), lengths)
+    positions = numpy.arange(len(deck_ids)) - offsets[deck_ids]
+    match_grid = numpy.zeros((len(lengths), lengths.max()), dtype=numpy.int64)
+    match_grid[deck_ids, positions] = matches
+    quantity = numpy.zeros_like(match_grid)
+    quantity[deck_ids, positions] = 1
+
+    rows = numpy.arange(len(lengths))
+    copies_won = numpy.zeros((len(lengths), lengths.max() + 1), dtype=numpy.int64)
+    running_copies = numpy.zeros(len(lengths), dtype=numpy.int64)
+
+    for idx in range(lengths.max()):
+        running_copies += copies_won[:, idx]
+        quantity[:, idx] += running_copies
+
+        # A card with no matches adds and removes its copies on the same column
+        copies_won[:, idx + 1] += quantity[:, idx]
+        copies_won[rows, numpy.minimum(idx + 1 + match_grid[:, idx], lengths)] -= quantity[:, idx]
+
+    part_two = quantity.sum(axis=1)
+    return list(zip(part_one.tolist(), part_two.tolist()))
+
+
+def _score_batch(decks):
+    return score_packed_decks(*pack_decks(decks))
+
+
+def score_decks(decks, workers=None):
+    """ Score part one and part two of every deck, returned as (points, cards) per deck. """
+    if not workers or workers < 2 or len(decks) < 2:
+        return _score_batch(decks)
+
+    batch_size = -(-len(decks) // workers)
+    batches = [decks[idx:idx + batch_size] for idx in range(0, len(decks), batch_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_score_batch, batches)
+
+    return [score for batch in results for score in batch]
 
 
 def main(raw_data, part_two = False):
@@ -203,12 +330,7 @@ def main(raw_data, part_two = False):
 
     # Part 2
     else:
-        result = []
-        for scratch_card in scratch_cards:
-            point_value = win_scratch_cards(scratch_card, scratch_cards)
-            result.append(point_value)
-
-        quantity = [x.quantity for x in scratch_cards]
+        quantity = win_scratch_cards(scratch_cards)
         print(f'\nYou end up with {sum(quantity)} total scratchcards.\n\t{quantity}\n')
 
 
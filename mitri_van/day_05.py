@@ -179,8 +179,10 @@ line of the almanac. What is the lowest location number that corresponds to
 any of the initial seed numbers?
 
 """
-import copy
-from collections import defaultdict, deque
+from bisect import bisect_right
+from collections import defaultdict
+
+import numpy
 
 test_data = [ 'seeds: 79 14 55 13',
               '',
@@ -233,12 +235,84 @@ DEBUG = True
 
 
 
+class IntervalSet():
+    """ Sorted, coalesced half-open [start, end) intervals held in numpy arrays. """
+
+    def __init__(self, starts, ends):
+        starts = numpy.asarray(starts, dtype=numpy.int64)
+        ends = numpy.asarray(ends, dtype=numpy.int64)
+
+        keep = ends > starts
+        order = numpy.argsort(starts[keep], kind='stable')
+        starts = starts[keep][order]
+        ends = ends[keep][order]
+
+        # A new group begins wherever an interval starts past every earlier end
+        if len(starts):
+            reach = numpy.maximum.accumulate(ends)
+            group_starts = numpy.flatnonzero(numpy.r_[True, starts[1:] > reach[:-1]])
+            starts = starts[group_starts]
+            ends = numpy.maximum.reduceat(ends, group_starts)
+
+        self.starts = starts
+        self.ends = ends
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} ({len(self)} intervals)>"
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def from_seed_ranges(cls, seeds):
+        seeds = numpy.asarray(seeds, dtype=numpy.int64).reshape(-1, 2)
+        return cls(seeds[:, 0], seeds[:, 0] + seeds[:, 1])
+
+    def as_seed_ranges(self):
+        return list(zip(self.starts.tolist(), (self.ends - self.starts).tolist()))
+
+    def split(self, breakpoints):
+        """ Cut the intervals at every breakpoint that falls strictly inside one.
+
+        Returns the raw piece starts and ends; the pieces are left uncoalesced.
+        """
+        breakpoints = numpy.asarray(breakpoints, dtype=numpy.int64)
+        if not len(breakpoints) or not len(self):
+            return self.starts.copy(), self.ends.copy()
+
+        first_cut = numpy.searchsorted(breakpoints, self.starts, side='right')
+        cuts = numpy.searchsorted(breakpoints, self.ends, side='left') - first_cut
+        pieces = cuts + 1
+
+        interval = numpy.repeat(numpy.arange(len(self)), pieces)
+        piece = numpy.arange(pieces.sum()) - numpy.repeat(numpy.cumsum(pieces) - pieces, pieces)
+        last = len(breakpoints) - 1
+
+        starts = numpy.where(piece == 0, self.starts[interval],
+                             breakpoints[numpy.minimum(first_cut[interval] + piece - 1, last)])
+        ends = numpy.where(piece == cuts[interval], self.ends[interval],
+                           breakpoints[numpy.minimum(first_cut[interval] + piece, last)])
+
+        return starts, ends
+
+    def shift(self, offset):
+        return IntervalSet(self.starts + offset, self.ends + offset)
+
+    def merge(self, other):
+        return IntervalSet(numpy.r_[self.starts, other.starts], numpy.r_[self.ends, other.ends])
+
+
 class MappingTable():
 
     def __init__(self, id, data):
         self.id = id
         self.data = {}
 
+        # Sorted interval index over self.data, built once for bisect lookups
+        self.starts = []
+        self.lengths = []
+        self.offsets = []
+
         self.initialize_data(data)
 
     def __repr__(self):
@@ -252,58 +326,48 @@ class MappingTable():
             target, source, map_range = item.split()
             self.data[int(source)] = (int(target), int(map_range))
 
+        for key in sorted(self.data.keys()):
+            self.starts.append(key)
+            self.lengths.append(self.data[key][1])
+            self.offsets.append(self.data[key][0] - key)
+
+        self._start_array = numpy.array(self.starts, dtype=numpy.int64)
+        self._end_array = self._start_array + numpy.array(self.lengths, dtype=numpy.int64)
+        self._offset_array = numpy.array(self.offsets, dtype=numpy.int64)
 
     def get_target_value(self, seed_value):
-        target_value = seed_value
-        # if source_value in the range of each data-key value
-        for key in reversed(sorted(self.data.keys())):
-            range_start_value = self.data[key][0]
-            range_size = self.data[key][1]
+        # Last range starting at or before the seed is the only one that can hold it
+        idx = bisect_right(self.starts, seed_value) - 1
+        if idx >= 0 and seed_value < self.starts[idx] + self.lengths[idx]:
+            return seed_value + self.offsets[idx]
 
-            if key <= seed_value <= key + range_size - 1:
-                target_value = seed_value - key + range_start_value
+        return seed_value
 
-        return target_value
+    def get_target_values(self, seed_values):
+        """ Map a whole numpy int64 array of seeds through this table at once. """
+        seed_values = numpy.asarray(seed_values, dtype=numpy.int64)
+        if not self.starts:
+            return seed_values.copy()
 
-    def get_target_value_range(self, seed, recurse_depth='\t'):
-        overlap_range = 0
-        results = []
+        idx = numpy.searchsorted(self._start_array, seed_values, side='right') - 1
+        clipped = numpy.maximum(idx, 0)
+        inside = (idx >= 0) & (seed_values < self._end_array[clipped])
 
-        target_value = None
-        target_range = None
+        return seed_values + numpy.where(inside, self._offset_array[clipped], 0)
 
-        seed_value = seed[0]
-        seed_range = seed[1]
+    def get_target_intervals(self, interval_set):
+        """ Map every interval of an IntervalSet through this table. """
+        if not self.starts:
+            return interval_set
 
-        # Find the key range the supplied seed fits into
-        for key in sorted(self.data.keys()):
-            range_value_initial = self.data[key][0]
-            range_size = self.data[key][1]
-
-            # Supplied value is in this mapping range; use overlapped value if this check bled over from a previous iteration
-            if overlap_range or (key <= seed_value <= key + range_size - 1):
-                if DEBUG: print(f'{recurse_depth}get_target_value_range: {range_value_initial} {key} {range_size}')
-                new_seed_value = seed_value - key + range_value_initial
-                if overlap_range:
-                    new_seed_value = range_value_initial
-
-                # Supplied value is contained in one of the map ranges
-                if seed_value + seed_range <= key + range_size:
-                    if overlap_range:
-                        results.append((new_seed_value, seed_range - overlap_range))
-                        overlap_range = 0
-                    else:
-                        results.append((new_seed_value, seed_range))
-
-                # Supplied value overlaps multiple map ranges
-                # Add the current range and bookmark the overlapped range
-                else:
-                    overlap_range = key + range_size - 1 - seed_value
-                    results.append((new_seed_value, overlap_range))
-        if results:
-            return results
-
-        return [seed]
+        # Cut the intervals on every range edge so each piece shifts as a whole
+        starts, ends = interval_set.split(numpy.union1d(self._start_array, self._end_array))
+        idx = numpy.searchsorted(self._start_array, starts, side='right') - 1
+        clipped = numpy.maximum(idx, 0)
+        inside = (idx >= 0) & (starts < self._end_array[clipped])
+        offsets = numpy.where(inside, self._offset_array[clipped], 0)
+
+        return IntervalSet(starts + offsets, ends + offsets)
 
     def print_map(self):
         print(f'{self.id}:')
@@ -324,78 +388,56 @@ def _print_map(data, ver=0):
 
 
 def find_location_by_seed(seed_num, data):
-    result = None
+    location = seed_num
 
-    current_location_map = data.popleft()
-    location = current_location_map.get_target_value(seed_num)
-    if DEBUG: print(f'{current_location_map.id}:\n\t{seed_num} -> {location}')
-
-    if data:
-        result = find_location_by_seed(location, data)
-
-    if result:
-        return result
+    # Walk the shared chain in order; the tables themselves are never touched
+    for current_location_map in data:
+        new_location = current_location_map.get_target_value(location)
+        if DEBUG: print(f'{current_location_map.id}:\n\t{location} -> {new_location}')
+        location = new_location
 
     return location
 
 
-def find_location_by_seed_range(seed, data, recurse_depth = '\t'):
-    result = []
+def find_location_by_seed_range(seeds, data):
+    locations = IntervalSet.from_seed_ranges(seeds)
 
-    current_location_map = data.popleft()
-    locations = current_location_map.get_target_value_range(seed, recurse_depth)
-    # if DEBUG: print(f'\t{current_location_map.id}:\n\t\t{seed} -> {locations}')
-    if DEBUG: print(f'\n{recurse_depth}{current_location_map.id}:\n{recurse_depth}\t{seed} -> {locations}')
-    if data:
-        for location in locations:
-            x = find_location_by_seed_range(location, copy.deepcopy(data), recurse_depth = recurse_depth + '\t')
-            if isinstance(x, list):
-                result = result + x
-            else:
-                result.append(x)
+    for current_location_map in data:
+        new_locations = current_location_map.get_target_intervals(locations)
+        if DEBUG: print(f'{current_location_map.id}:\n\t{locations.as_seed_ranges()} -> {new_locations.as_seed_ranges()}')
+        locations = new_locations
+
+    return locations
 
-    else:
-        if len(locations) != 1:
-            for location in locations:
-                x = current_location_map.get_target_value_range(location)
-                if isinstance(x, list):
-                    if len(x) != 1:
-                        assert "Wtf"
-                    else:
-                        result.append((x[0][0], 0))
-
-                else:
-                    result.append((x, 0))
-        else:
-            result.append((locations[0][0],0))
 
-    if result:
-        return result
+def find_locations_batch(seeds, resource_mappings):
+    locations = numpy.asarray(seeds, dtype=numpy.int64)
+    for mapping_table in resource_mappings:
+        locations = mapping_table.get_target_values(locations)
 
     return locations
 
 
-def find_seed_location(seeds, resource_mappings):
-    results = []
-    locations = []
+def find_lowest_location_batch(seeds, resource_mappings):
+    seeds = numpy.asarray(seeds, dtype=numpy.int64)
+    locations = find_locations_batch(seeds, resource_mappings)
+    idx = numpy.argmin(locations)
 
-    for seed in seeds:
-        if DEBUG: print(f'Seed: {seed}')
-        # Part 1
-        if not isinstance(seed, tuple):
-            locations = find_location_by_seed(seed, copy.deepcopy(resource_mappings))
+    return int(seeds[idx]), int(locations[idx])
 
-        # Part 2
-        else:
-            locations = find_location_by_seed_range(seed, copy.deepcopy(resource_mappings))
 
-        if isinstance(locations, list):
-            results = results + locations
-        else:
-            results.append(locations)
+def find_seed_location(seeds, resource_mappings):
+    # Part 2: every seed range flows through the chain together as one interval set
+    if seeds and isinstance(seeds[0], tuple):
+        return find_location_by_seed_range(seeds, resource_mappings).as_seed_ranges()
 
+    # Part 1
+    results = []
+    for seed in seeds:
+        if DEBUG: print(f'Seed: {seed}')
+        results.append(find_location_by_seed(seed, resource_mappings))
         if DEBUG: print('')
-# Figure out what happens when more than 2 locations are returned
+
     return results
 
 
@@ -455,7 +497,6 @@ def parse_seeds(data):
 def main(raw_data, part_two = False):
     data = parse_data(raw_data)
 
-    resource_mappings = deque()
     result = []
 
     # Define seeds
@@ -464,10 +505,8 @@ def main(raw_data, part_two = False):
     if part_two:
         seeds = parse_seeds(data[SEED_HEADER])
 
-    # Define resource mappings
-    for key in RESOURCE_MAP[1:]:
-        new_mapping_table = MappingTable(key, data[key])
-        resource_mappings.append(new_mapping_table)
+    # Define resource mappings; an immutable chain shared by every seed
+    resource_mappings = tuple(MappingTable(key, data[key]) for key in RESOURCE_MAP[1:])
 
     # Find seed location
     result = find_seed_location(seeds, resource_mappings)
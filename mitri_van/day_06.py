@@ -122,6 +122,8 @@ Your puzzle answer was 27102791.
 
 Both parts of this puzzle are complete! They provide two gold stars: **
 """
+import math
+
 import numpy
 
 test_data = [ 'Time:      7  15   30',
@@ -130,19 +132,133 @@ test_data = [ 'Time:      7  15   30',
 
 DEBUG = False
 
+# Races inside these bounds keep time**2 - 4 * distance inside int64
+FAST_TIME_LIMIT = 2 ** 31
+FAST_DISTANCE_LIMIT = 2 ** 60
+
 
 def calculate_optimal_presses(race):
+    """ Return the (first, last) winning press, or None if the race can't be won.
+
+    Distance is unimodal in the press time and symmetric around time / 2, so a
+    binary search up to the peak finds the first win and the last one mirrors it.
+    """
     time = race[0]
     distance = race[1]
-    results = []
 
-    if DEBUG: print('\nRace: ')
-    for x in range(1, time):
-        if DEBUG: print(f'\tPress: {x} Distance: {x * (time - x)}')
-        if (x * (time - x)) > distance:
-            results.append(x)
+    peak = time // 2
+    if peak < 1 or peak * (time - peak) <= distance:
+        return None
+
+    low, high = 1, peak
+    while low < high:
+        press = (low + high) // 2
+        if press * (time - press) > distance:
+            high = press
+        else:
+            low = press + 1
+
+    if DEBUG: print(f'\nRace: {race}\n\tPresses: {low} - {time - low}')
+    return low, time - low
+
+
+def count_optimal_presses(race):
+    presses = calculate_optimal_presses(race)
+    if presses is None:
+        return 0
+
+    return presses[1] - presses[0] + 1
+
+
+def count_optimal_presses_numpy(race):
+    """ Brute-force count over every press at once, for cross-checking. """
+    time = race[0]
+    distance = race[1]
+
+    presses = numpy.arange(1, time, dtype=numpy.int64)
+    return int(numpy.count_nonzero(presses * (time - presses) > distance))
+
+
+def _count_presses_exact(time, distance):
+    # x * (time - x) > distance  <=>  (2x - time)**2 < time**2 - 4 * distance
+    discriminant = time * time - 4 * distance
+    if discriminant <= 0:
+        return 0
+
+    spread = math.isqrt(discriminant - 1)
+    low = max((time - spread + 1) // 2, 1)
+    high = min((time + spread) // 2, time - 1)
+
+    return max(high - low + 1, 0)
+
+
+def _count_presses_fast(times, distances):
+    discriminants = times * times - 4 * distances
+    winnable = discriminants > 0
+    values = numpy.where(winnable, discriminants - 1, 0)
+
+    # Float sqrt is within a step or two of the integer root; settle it exactly
+    spreads = numpy.floor(numpy.sqrt(values.astype(numpy.float64))).astype(numpy.int64)
+    while (too_big := spreads * spreads > values).any():
+        spreads -= too_big
+    while (too_small := (spreads + 1) * (spreads + 1) <= values).any():
+        spreads += too_small
+
+    low = numpy.maximum((times - spreads + 1) // 2, 1)
+    high = numpy.minimum((times + spreads) // 2, times - 1)
+
+    return numpy.where(winnable, numpy.maximum(high - low + 1, 0), 0)
+
+
+def count_optimal_presses_batch(times, distances):
+    """ Count the winning presses of every (time, distance) race.
+
+    Races whose numbers fit the int64 bounds are solved with vectorized
+    integer roots; the rest fall back to exact Python ints, in which case an
+    object array is returned.
+    """
+    times = numpy.asarray(times)
+    distances = numpy.asarray(distances)
+
+    fast = (abs(times) < FAST_TIME_LIMIT) & (abs(distances) < FAST_DISTANCE_LIMIT)
+    fast_counts = _count_presses_fast(times[fast].astype(numpy.int64), distances[fast].astype(numpy.int64))
+    if fast.all():
+        return fast_counts
+
+    counts = numpy.zeros(len(times), dtype=object)
+    counts[fast] = fast_counts.tolist()
+    for idx in numpy.flatnonzero(~fast):
+        counts[idx] = _count_presses_exact(int(times[idx]), int(distances[idx]))
+
+    return counts
+
+
+def winning_ways_batch(times, distances):
+    return math.prod(count_optimal_presses_batch(times, distances).tolist())
+
+
+def load_races(path, allow_pickle=False):
+    """ Read (time, distance) pairs from a .npy file or a two column CSV.
+
+    Races past int64 are best kept in CSV; a .npy holding them is an object
+    array, which is only unpickled when allow_pickle is set.
+    """
+    if path.endswith('.npy'):
+        races = numpy.load(path, allow_pickle=allow_pickle)
+        return races[:, 0], races[:, 1]
+
+    times = []
+    distances = []
+    with open(path, "r") as input_file:
+        for line in input_file:
+            fields = line.strip().split(',')
+            # Skip blank lines and a header row
+            if len(fields) != 2 or not fields[0].strip().lstrip('-').isdigit():
+                continue
+            times.append(int(fields[0]))
+            distances.append(int(fields[1]))
 
-    return results
+    return numpy.array(times), numpy.array(distances)
 
 
 def parse_data(raw_data, part_two = False):
@@ -161,21 +277,17 @@ def parse_data(raw_data, part_two = False):
 
 
 def main(raw_data, part_two = False):
-    races = []
-    results = []
+    winning_ways = []
 
     if not part_two:
         race_data = parse_data(raw_data)
         for race in race_data:
-            result = calculate_optimal_presses(race)
-            results.append(result)
+            winning_ways.append(count_optimal_presses(race))
 
     else:
         race_data = parse_data(raw_data, part_two = True)
-        result = calculate_optimal_presses(race_data)
-        results.append(result)
+        winning_ways.append(count_optimal_presses(race_data))
 
-    winning_ways = [len(x) for x in results]
     print(f'\nNumber of ways to win: {numpy.prod(winning_ways)}')
 
 
@@ -162,9 +162,11 @@ class Card():
         self.rank = rank
         self.type = 0
         self.part_two = part_two
+        self.key = 0
 
         self._set_hand()
         self._set_type()
+        self._set_key()
 
     def __repr__(self):
         return f"<{self.__class__.__name__} {self.id} ({self.bid},{self.rank}) {self.get_type()}>"
@@ -173,53 +175,13 @@ class Card():
         return f"<{self.__class__.__name__} {self.id} ({self.bid},{self.rank}) {self.get_type()}> {self._hand}"
 
     def __eq__(self, other):
-        if self.type == other.type:
-            self_val = self._hand[idx]
-            other_val = other._hand[idx]
-            if self.part_two and self_val == 'B': self_val = '1'
-            if self.part_two and other_val == 'B': other_val = '1'
-
-            for idx in range(0,5):
-                if self_val != other_val:
-                    return False
-            return False
-        return self.type == other.type
+        return self.key == other.key
 
     def __gt__(self, other):
-        if self.type == other.type:
-            for idx in range(0,5):
-                self_val = self._hand[idx]
-                other_val = other._hand[idx]
-                if self.part_two and self_val == 'B': self_val = '1'
-                if self.part_two and other_val == 'B': other_val = '1'
-
-                if int(self_val, 16) > int(other_val, 16):
-                    return True
-                elif int(self_val, 16) < int(other_val, 16):
-                    return False
-                else:
-                    pass # Values are equal, continue checking
-            return False
-        return self.type > other.type
+        return self.key > other.key
 
     def __lt__(self, other):
-        if self.type == other.type:
-            for idx in range(0,5):
-                self_val = self._hand[idx]
-                other_val = other._hand[idx]
-                if self.part_two and self_val == 'B': self_val = '1'
-                if self.part_two and other_val == 'B': other_val = '1'
-
-                if int(self_val, 16) < int(other_val, 16):
-                    return True
-                elif int(self_val, 16) > int(other_val, 16):
-                    return False
-                else:
-                    pass # Values are equal, continue checking
-
-            return False
-
-        return self.type < other.type
+        return self.key < other.key
 
     def _set_hand(self):
         hand = self.id.replace('A', 'E').replace('K', 'D').replace('Q', 'C').replace('J', 'B').replace('T', 'A')
@@ -290,6 +252,11 @@ class Card():
                 if self.type == 0:
                     self.type = 1
 
+    def _set_key(self):
+        # Type in the high bits, then each card's strength as one hex digit
+        hand = self._hand.replace('B', '1') if self.part_two else self._hand
+        self.key = (self.type << 20) | int(hand, 16)
+
     @property
     def winnings(self):
         return self.bid * self.rank
@@ -323,7 +290,7 @@ class Card():
 def set_rank(cards,  part_two = False):
     idx = 0
 
-    for card in sorted(cards):
+    for card in sorted(cards, key=lambda card: card.key):
         card.rank = idx + 1
         idx += 1
 
@@ -342,7 +309,7 @@ def main(raw_data, part_two = False):
     cards = parse_data(raw_data, part_two)
     set_rank(cards, part_two)
 
-    [print(f'{card} : {card.winnings}') for card in sorted(cards)]
+    [print(f'{card} : {card.winnings}') for card in sorted(cards, key=lambda card: card.key)]
 
     winnings = sum([card.winnings for card in cards])
 
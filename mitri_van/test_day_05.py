@@ -0,0 +1,47 @@
+import random
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+
+_spec = spec_from_file_location("mitri_day_05", Path(__file__).with_name("day_05.py"))
+day_05 = module_from_spec(_spec)
+_spec.loader.exec_module(day_05)
+day_05.DEBUG = False
+
+
+def random_tables(rng):
+    tables = []
+    for idx in range(rng.randint(1, 7)):
+        # Non-overlapping source ranges, written in random order like the almanac
+        source = rng.randint(0, 5)
+        lines = []
+        for _ in range(rng.randint(0, 6)):
+            length = rng.randint(1, 10)
+            lines.append(f'{rng.randint(0, 80)} {source} {length}')
+            source += length + rng.randint(0, 4)
+        rng.shuffle(lines)
+        tables.append(day_05.MappingTable(idx, lines))
+    return tuple(tables)
+
+
+def test_seed_ranges_match_point_wise_mapping():
+    rng = random.Random(20)
+    for _ in range(500):
+        tables = random_tables(rng)
+        seeds = [(rng.randint(0, 100), rng.randint(0, 25)) for _ in range(rng.randint(0, 6))]
+
+        result = day_05.find_seed_location(seeds, tables)
+        mapped = {start + offset for start, length in result for offset in range(length)}
+        expected = {day_05.find_location_by_seed(seed, tables)
+                    for start, length in seeds for seed in range(start, start + length)}
+        assert mapped == expected, (seeds, tables)
+
+        # Coalesced: sorted and never touching
+        assert all(start + length < next_start for (start, length), (next_start, _) in zip(result, result[1:]))
+
+
+def test_example_almanac():
+    data = day_05.parse_data(day_05.test_data)
+    tables = tuple(day_05.MappingTable(key, data[key]) for key in day_05.RESOURCE_MAP[1:])
+    seeds = day_05.parse_seeds(data[day_05.SEED_HEADER])
+
+    assert min(x[0] for x in day_05.find_seed_location(seeds, tables)) == 46